@@ -1,11 +1,38 @@
+from modules.gf_gehalt.cache import (
+    ReportCache,
+    calculate_business_report_cached,
+    calculate_business_reports_cached,
+)
+from modules.gf_gehalt.household import (
+    HouseholdInput,
+    HouseholdOptimum,
+    calculate_household_report,
+    optimize_household,
+)
+from modules.gf_gehalt.kv_vergleich import KvBreakEven, find_kv_break_even
 from modules.gf_gehalt.service import (
     CalculationInput,
     calculate_business_report,
+    calculate_business_reports,
     write_report_artifact,
 )
+from modules.gf_gehalt.tariff import Tariff, compile_tariffs, get_tariff
 
 __all__ = [
     "CalculationInput",
+    "HouseholdInput",
+    "HouseholdOptimum",
+    "KvBreakEven",
+    "ReportCache",
+    "Tariff",
     "calculate_business_report",
+    "calculate_business_report_cached",
+    "calculate_business_reports",
+    "calculate_business_reports_cached",
+    "calculate_household_report",
+    "compile_tariffs",
+    "find_kv_break_even",
+    "get_tariff",
+    "optimize_household",
     "write_report_artifact",
 ]
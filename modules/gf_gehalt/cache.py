@@ -0,0 +1,212 @@
+import hashlib
+import json
+import marshal
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import fields
+from operator import attrgetter
+from pathlib import Path
+
+from modules.gf_gehalt.service import CalculationInput, calculate_business_reports
+from modules.utils.helper import Helper
+
+REPORT_CACHE_PATH = os.getenv("REPORT_CACHE_PATH")
+
+# Bump whenever the report calculation or the key format changes, so stale entries are never served.
+CACHE_VERSION = 3
+
+_SQLITE_CHUNK = 2000
+# Eviction trims the table this far below max_entries, so the next row count is far away.
+_EVICTION_HEADROOM = 0.1
+
+_INPUT_FIELDS = attrgetter(*(field.name for field in fields(CalculationInput)))
+_INPUT_STRUCT = struct.Struct(f"<{len(fields(CalculationInput))}d")
+
+
+def input_key(inputs: CalculationInput) -> bytes:
+    """All input fields packed as doubles: exact, canonical (30000 == 30000.0) and cheap to build."""
+    return _INPUT_STRUCT.pack(*_INPUT_FIELDS(inputs))
+
+
+def config_fingerprint(config: dict) -> str:
+    payload = json.dumps(
+        {"version": CACHE_VERSION, "marshal": marshal.version, "steuern": config["steuern"]},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """SQLite report cache shared by processes, with approximate LRU eviction.
+
+    A hit refreshes the access time only when it is older than touch_after seconds, so warm reads do not
+    queue behind the single SQLite writer. The row count is tracked per process and checked against the
+    table only when the estimate exceeds max_entries. The config fingerprint is remembered for the config
+    seen last; copy a config that is already in use before editing it. Reports are stored with marshal, so
+    the cache file must be as trusted as the code.
+    """
+
+    def __init__(
+        self, path: str, max_entries: int = 1_000_000, timeout: float = 30.0, touch_after: float = 300.0
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries muss größer als 0 sein!")
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.touch_after = touch_after
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self._rows = 0
+        self._fingerprint: tuple[dict, str] | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so every process opens its own.
+        if self._connection is None or self._pid != os.getpid():
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS reports ("
+                " config TEXT NOT NULL, input BLOB NOT NULL, report BLOB NOT NULL, accessed REAL NOT NULL,"
+                " PRIMARY KEY (config, input))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS reports_accessed ON reports (accessed)")
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+            self._rows = connection.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        return self._connection
+
+    def _config_fingerprint(self, config: dict) -> str:
+        cached = self._fingerprint
+        if cached is None or cached[0] is not config:
+            cached = (config, config_fingerprint(config))
+            self._fingerprint = cached
+        return cached[1]
+
+    def get_many(self, inputs: Sequence[CalculationInput], config: dict) -> list[dict | None]:
+        fingerprint = self._config_fingerprint(config)
+        keys = [input_key(item) for item in inputs]
+        found: dict[bytes, bytes] = {}
+        stale: list[bytes] = []
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(keys), _SQLITE_CHUNK):
+                chunk = keys[start : start + _SQLITE_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT input, report, accessed FROM reports WHERE config = ? AND input IN ({placeholders})",
+                    (fingerprint, *chunk),
+                ).fetchall()
+                for key, report, accessed in rows:
+                    found[key] = report
+                    if accessed < now - self.touch_after:
+                        stale.append(key)
+            if stale:
+                with connection:
+                    connection.executemany(
+                        "UPDATE reports SET accessed = ? WHERE config = ? AND input = ?",
+                        [(now, fingerprint, key) for key in stale],
+                    )
+        return [marshal.loads(found[key]) if key in found else None for key in keys]
+
+    def put_many(self, items: Iterable[tuple[CalculationInput, dict]], config: dict) -> None:
+        fingerprint = self._config_fingerprint(config)
+        now = time.time()
+        rows = [(fingerprint, input_key(item), marshal.dumps(report), now) for item, report in items]
+        if not rows:
+            return
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?)", rows)
+                self._rows += len(rows)
+                if self._rows > self.max_entries:
+                    self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        # The estimate ignores replaced rows and other processes, so recount before deleting anything.
+        self._rows = connection.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        if self._rows <= self.max_entries:
+            return
+        target = self.max_entries - int(self.max_entries * _EVICTION_HEADROOM)
+        connection.execute(
+            "DELETE FROM reports WHERE rowid IN (SELECT rowid FROM reports ORDER BY accessed, rowid LIMIT ?)",
+            (self._rows - target,),
+        )
+        self._rows = target
+
+    def get(self, inputs: CalculationInput, config: dict) -> dict | None:
+        return self.get_many([inputs], config)[0]
+
+    def put(self, inputs: CalculationInput, config: dict, report: dict) -> None:
+        self.put_many([(inputs, report)], config)
+
+    def clear(self) -> None:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM reports")
+            self._rows = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+            self._pid = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+
+def calculate_business_reports_cached(
+    inputs: Iterable[CalculationInput], cache: ReportCache | None = None, config: dict | None = None
+) -> list[dict]:
+    """Like calculate_business_reports, backed by cache or else by the REPORT_CACHE_PATH cache if configured."""
+    data = config if config is not None else Helper.load_config_yml()
+    cache = cache if cache is not None else default_report_cache()
+    if cache is None:
+        return calculate_business_reports(inputs, data)
+
+    batch = list(inputs)
+    reports = cache.get_many(batch, data)
+    missing = [index for index, report in enumerate(reports) if report is None]
+    if missing:
+        computed = calculate_business_reports([batch[index] for index in missing], data)
+        cache.put_many(zip((batch[index] for index in missing), computed), data)
+        for index, report in zip(missing, computed):
+            reports[index] = report
+    return [report for report in reports if report is not None]
+
+
+def calculate_business_report_cached(
+    inputs: CalculationInput, cache: ReportCache | None = None, config: dict | None = None
+) -> dict:
+    return calculate_business_reports_cached([inputs], cache, config)[0]
+
+
+_default_cache: ReportCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def default_report_cache() -> ReportCache | None:
+    """The process-wide cache at REPORT_CACHE_PATH, or None if the variable is not set."""
+    global _default_cache
+    if not REPORT_CACHE_PATH:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache.path != REPORT_CACHE_PATH:
+            _default_cache = ReportCache(REPORT_CACHE_PATH)
+        return _default_cache
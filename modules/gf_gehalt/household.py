@@ -0,0 +1,259 @@
+import math
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from itertools import product
+
+from modules.gf_gehalt.service import (
+    CalculationInput,
+    ReportBasis,
+    calc_kirchensteuer_zusammenveranlagung,
+    calc_soli,
+    calc_tax,
+    get_grenzsteuersatz,
+    netto_vor_einkommensteuer,
+    report_basis,
+)
+from modules.gf_gehalt.tariff import Tariff, get_tariff
+from modules.utils.helper import Helper
+
+_SOLVER_PRECISION = 0.01
+# Gewerbesteuer is rounded to cents, so slopes are central differences over ±5 € to stay well above that noise.
+_SLOPE_STEP = 5.0
+
+
+@dataclass(frozen=True)
+class HouseholdInput:
+    partner_a: CalculationInput
+    partner_b: CalculationInput | None = None
+
+
+@dataclass(frozen=True)
+class HouseholdOptimum:
+    gf_gehalt_a: float
+    gf_gehalt_b: float | None
+    report: dict
+    evaluations: int
+
+
+def _partners(household: HouseholdInput) -> tuple[CalculationInput, ...]:
+    partners = (household.partner_a,) if household.partner_b is None else (household.partner_a, household.partner_b)
+    if any(partner.steuerjahr != household.partner_a.steuerjahr for partner in partners):
+        raise ValueError("Beide Ehepartner müssen im selben Steuerjahr veranlagt werden!")
+    return tuple(replace(partner, verheiratet=False, ehepartner_zve=0) for partner in partners)
+
+
+def _fixed_ehepartner_zve(household: HouseholdInput) -> float:
+    return household.partner_a.ehepartner_zve if household.partner_b is None else 0
+
+
+def _kirchensteuer(
+    ekst: float,
+    household: HouseholdInput,
+    partners: tuple[CalculationInput, ...],
+    bases: list[ReportBasis],
+    tariff: Tariff,
+) -> float:
+    ehegatten = [
+        (basis.zve, partner.kirchensteuer, partner.kirchensteuer_satz) for partner, basis in zip(partners, bases)
+    ]
+    if household.partner_b is None:
+        partner = household.partner_a
+        ehegatten.append((partner.ehepartner_zve, partner.ehepartner_kirchensteuer, partner.kirchensteuer_satz))
+    return calc_kirchensteuer_zusammenveranlagung(ekst, ehegatten, tariff)
+
+
+def _partner_report(partner: CalculationInput, basis: ReportBasis) -> dict:
+    return {
+        "gf_gehalt": round(partner.gf_gehalt, 2),
+        "gmbh_gewinn_vor_steuern": round(basis.gmbh_gewinn_vor_steuern, 2),
+        "gmbh_steuern_gesamt": round(basis.gmbh_steuern_gesamt, 2),
+        "gmbh_gewinn_nach_steuern": round(basis.gmbh_gewinn_nach_steuern, 2),
+        "gesamtes_gf_brutto": round(basis.gesamtes_gf_brutto, 2),
+        "krankenkassenbeitrag": round(basis.gf_krankenkassenbeitrag, 2),
+        "zve": round(basis.zve, 2),
+    }
+
+
+def calculate_household_report(household: HouseholdInput, config: dict | None = None) -> dict:
+    data = config if config is not None else Helper.load_config_yml()
+
+    partners = _partners(household)
+    bases = [report_basis(partner, data) for partner in partners]
+    fixed = _fixed_ehepartner_zve(household)
+    year = household.partner_a.steuerjahr
+
+    zve = sum(basis.zve for basis in bases) + fixed
+    ekst = calc_tax(zve, True, year, data)
+    soli = calc_soli(ekst, True, year, data)
+    kirchensteuer = _kirchensteuer(ekst, household, partners, bases, get_tariff(year, data))
+    persoenliche_steuern = ekst + soli + kirchensteuer
+
+    gesamter_nettoerloes = sum(netto_vor_einkommensteuer(basis) for basis in bases) - persoenliche_steuern
+    gesamte_abgaben = (
+        sum(basis.gmbh_steuern_gesamt + basis.gf_krankenkassenbeitrag for basis in bases) + persoenliche_steuern
+    )
+
+    return {
+        "steuerjahr": year,
+        "partner_a": _partner_report(partners[0], bases[0]),
+        "partner_b": _partner_report(partners[1], bases[1]) if len(partners) > 1 else None,
+        "ehepartner_zve": round(fixed, 2),
+        "zve": round(zve, 2),
+        "einkommensteuer": round(ekst, 2),
+        "solidaritaetszuschlag": round(soli, 2),
+        "kirchensteuer": round(kirchensteuer, 2),
+        "grenzsteuersatz": round(get_grenzsteuersatz(zve, True, year, data), 2),
+        "gesamter_nettoerloes": round(gesamter_nettoerloes, 2),
+        "gesamte_abgaben": round(gesamte_abgaben, 2),
+    }
+
+
+def _solve_increasing(f: Callable[[float], float], target: float, low: float, high: float) -> float:
+    if f(low) >= target:
+        return low
+    if f(high) < target:
+        return high
+    while high - low > _SOLVER_PRECISION:
+        middle = (low + high) / 2
+        if f(middle) >= target:
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+@dataclass(frozen=True)
+class _PartnerModel:
+    partner: CalculationInput
+    max_gehalt: int
+    breakpoints: tuple[float, ...]
+
+    def basis(self, gehalt: float, data: dict) -> ReportBasis:
+        return report_basis(replace(self.partner, gf_gehalt=gehalt), data)
+
+
+def _partner_model(partner: CalculationInput, data: dict) -> _PartnerModel:
+    max_gehalt = math.ceil(partner.gmbh_umsatz - partner.gmbh_kosten) - 1
+    if max_gehalt < 0:
+        raise ValueError("Das Unternehmen darf keinen Verlust machen!")
+
+    breakpoints = {0.0, float(max_gehalt)}
+    if partner.gkv:
+        kv_config = data["steuern"]["krankenversicherung"]
+        for grenze in (
+            kv_config["mindestbemessungsgrundlage"][partner.steuerjahr],
+            kv_config["beitragsbemessungsgrenzen"][partner.steuerjahr],
+        ):
+            gehalt = grenze - partner.andere_einkommen
+            if 0 < gehalt < max_gehalt:
+                breakpoints.add(gehalt)
+    return _PartnerModel(partner=partner, max_gehalt=max_gehalt, breakpoints=tuple(sorted(breakpoints)))
+
+
+class _HouseholdModel:
+    """Unrounded household net income, used to locate candidate salaries."""
+
+    def __init__(self, household: HouseholdInput, data: dict) -> None:
+        self.data = data
+        self.household = household
+        self.partners = _partners(household)
+        self.models = [_partner_model(partner, data) for partner in self.partners]
+        self.tariff = get_tariff(household.partner_a.steuerjahr, data)
+        self.zve_breakpoints = self.tariff.zve_breakpoints(True)
+        self.fixed = _fixed_ehepartner_zve(household)
+
+    def netto(self, gehaelter: list[float]) -> float:
+        bases = [model.basis(gehalt, self.data) for model, gehalt in zip(self.models, gehaelter)]
+        ekst = self.tariff.einkommensteuer(sum(basis.zve for basis in bases) + self.fixed, True)
+        steuern = ekst + self.tariff.solidaritaetszuschlag(ekst, True)
+        steuern += _kirchensteuer(ekst, self.household, self.partners, bases, self.tariff)
+        return sum(netto_vor_einkommensteuer(basis) for basis in bases) - steuern
+
+    def candidates_along(self, index: int, gehaelter: list[float]) -> set[float]:
+        """Salaries of one partner that can be optimal while the other partner's salary is held fixed.
+
+        The partner's KV floor/ceiling and the joint-zvE tariff and Soli breakpoints cut the salary axis
+        into intervals on which the objective is smooth and unimodal, so each interval contributes its
+        ends and the point where the slope of the objective changes sign.
+        """
+        model = self.models[index]
+
+        def netto_at(gehalt: float) -> float:
+            return self.netto(gehaelter[:index] + [gehalt] + gehaelter[index + 1 :])
+
+        def slope(gehalt: float) -> float:
+            return netto_at(gehalt - _SLOPE_STEP) - netto_at(gehalt + _SLOPE_STEP)
+
+        other_zve = self.fixed + sum(
+            m.basis(g, self.data).zve for i, (m, g) in enumerate(zip(self.models, gehaelter)) if i != index
+        )
+        candidates = set(model.breakpoints)
+        for low, high in zip(model.breakpoints, model.breakpoints[1:]):
+            zve_low = other_zve + model.basis(low, self.data).zve
+            zve_high = other_zve + model.basis(high, self.data).zve
+            edges = [low, high]
+            if zve_high > zve_low:
+                per_euro = (zve_high - zve_low) / (high - low)
+                edges += [low + (b - zve_low) / per_euro for b in self.zve_breakpoints if zve_low < b < zve_high]
+            edges.sort()
+            candidates.update(edges)
+            for start, end in zip(edges, edges[1:]):
+                if end - start > 2 * _SLOPE_STEP:
+                    candidates.add(_solve_increasing(slope, 0, start + _SLOPE_STEP, end - _SLOPE_STEP))
+        return candidates
+
+
+def optimize_household(household: HouseholdInput, config: dict | None = None) -> HouseholdOptimum:
+    """Jointly optimise the GF salaries of both spouses under Splitting.
+
+    Instead of a grid over both salaries, each salary is searched along the edges of the cells spanned by
+    the KV floor/ceiling of the other partner, followed by a coordinate ascent from the best candidate.
+    Every candidate is evaluated exactly with calculate_household_report.
+    """
+    data = config if config is not None else Helper.load_config_yml()
+    model = _HouseholdModel(household, data)
+
+    reports: dict[tuple[int, ...], dict] = {}
+
+    def evaluate(index: int, gehaelter: list[float]) -> None:
+        for gehalt in model.candidates_along(index, gehaelter):
+            for gerundet in {math.floor(gehalt), math.ceil(gehalt)}:
+                kandidat = [round(g) for g in gehaelter]
+                kandidat[index] = min(max(gerundet, 0), model.models[index].max_gehalt)
+                key = tuple(kandidat)
+                if key not in reports:
+                    reports[key] = calculate_household_report(_with_gehaelter(household, key), data)
+
+    def best() -> tuple[int, ...]:
+        return max(reports, key=lambda key: (reports[key]["gesamter_nettoerloes"], *(-g for g in key)))
+
+    for index in range(len(model.models)):
+        others = [m.breakpoints for i, m in enumerate(model.models) if i != index]
+        for fixed in product(*others):
+            gehaelter = list(fixed)
+            gehaelter.insert(index, 0.0)
+            evaluate(index, gehaelter)
+
+    current = best()
+    while True:
+        for index in range(len(model.models)):
+            evaluate(index, [float(g) for g in current])
+        improved = best()
+        if improved == current:
+            break
+        current = improved
+
+    report = reports[current]
+    return HouseholdOptimum(
+        gf_gehalt_a=current[0],
+        gf_gehalt_b=current[1] if len(current) > 1 else None,
+        report=report,
+        evaluations=len(reports),
+    )
+
+
+def _with_gehaelter(household: HouseholdInput, gehaelter: tuple[int, ...]) -> HouseholdInput:
+    partner_a = replace(household.partner_a, gf_gehalt=gehaelter[0])
+    if household.partner_b is None:
+        return HouseholdInput(partner_a=partner_a)
+    return HouseholdInput(partner_a=partner_a, partner_b=replace(household.partner_b, gf_gehalt=gehaelter[1]))
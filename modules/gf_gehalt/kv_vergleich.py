@@ -0,0 +1,133 @@
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+
+from modules.gf_gehalt.service import CalculationInput, calculate_business_reports
+from modules.gf_gehalt.tariff import get_tariff
+from modules.utils.helper import Helper
+
+BREAK_EVEN_PRECISION = 0.01
+
+
+@dataclass(frozen=True)
+class KvBreakEven:
+    steuerjahr: int
+    gf_gehalt: float
+    gesamtes_gf_brutto: float
+    pkv_guenstiger_ab: bool
+
+
+@dataclass(frozen=True)
+class _Scenario:
+    steuerjahr: int
+    gkv: CalculationInput
+    pkv: CalculationInput
+    max_gehalt: float
+    kv_breakpoints: tuple[float, ...]
+
+
+def _scenario(inputs: CalculationInput, year: int, data: dict) -> _Scenario:
+    base = replace(inputs, steuerjahr=year)
+    max_gehalt = math.ceil(base.gmbh_umsatz - base.gmbh_kosten) - 1
+    if max_gehalt < 0:
+        raise ValueError("Das Unternehmen darf keinen Verlust machen!")
+
+    kv_config = data["steuern"]["krankenversicherung"]
+    breakpoints = {0.0, float(max_gehalt)}
+    for grenze in (kv_config["mindestbemessungsgrundlage"][year], kv_config["beitragsbemessungsgrenzen"][year]):
+        gehalt = grenze - base.andere_einkommen
+        if 0 < gehalt < max_gehalt:
+            breakpoints.add(gehalt)
+
+    return _Scenario(
+        steuerjahr=year,
+        gkv=replace(base, gkv=True, kv_steuerlich_absetzbar_prozent=100),
+        pkv=replace(base, gkv=False),
+        max_gehalt=max_gehalt,
+        kv_breakpoints=tuple(sorted(breakpoints)),
+    )
+
+
+def _pkv_vorteil(points: list[tuple[_Scenario, float]], data: dict) -> list[float]:
+    """Net advantage of PKV over GKV (positive: PKV is better) for many (scenario, salary) points at once."""
+    batch = [replace(s.gkv, gf_gehalt=g) for s, g in points] + [replace(s.pkv, gf_gehalt=g) for s, g in points]
+    reports = calculate_business_reports(batch, data)
+    gkv, pkv = reports[: len(points)], reports[len(points) :]
+    return [p["gesamter_nettoerloes"] - g["gesamter_nettoerloes"] for g, p in zip(gkv, pkv)]
+
+
+def _salary_grid(scenario: _Scenario, data: dict) -> list[float]:
+    """KV floor/ceiling plus every salary at which either variant crosses a tariff or Soli breakpoint.
+
+    Within a KV piece the zvE of both variants is linear in the salary, so the tariff breakpoints can be
+    mapped back onto the salary axis exactly; between grid points the advantage is smooth.
+    """
+    tariff = get_tariff(scenario.steuerjahr, data)
+    zve_breakpoints = tariff.zve_breakpoints(scenario.gkv.verheiratet)
+    ends = list(scenario.kv_breakpoints)
+    reports = calculate_business_reports(
+        [replace(variant, gf_gehalt=g) for variant in (scenario.gkv, scenario.pkv) for g in ends], data
+    )
+
+    grid = set(ends)
+    for offset in (0, len(ends)):
+        for index, (low, high) in enumerate(zip(ends, ends[1:])):
+            zve_low = reports[offset + index]["zve"]
+            zve_high = reports[offset + index + 1]["zve"]
+            if zve_high <= zve_low:
+                continue
+            per_euro = (zve_high - zve_low) / (high - low)
+            grid.update(low + (b - zve_low) / per_euro for b in zve_breakpoints if zve_low < b < zve_high)
+    return sorted(grid)
+
+
+def find_kv_break_even(
+    inputs: CalculationInput, years: Iterable[int] | None = None, config: dict | None = None
+) -> dict[int, list[KvBreakEven]]:
+    """Salaries at which PKV (flat beitrag_pkv) and GKV give the same total net income, per tax year.
+
+    All years are evaluated together: the salary grid of every year goes through one batch evaluation and
+    the sign changes are then refined by lockstep bisection, again one batch per step. GKV contributions
+    are fully deductible, PKV contributions by kv_steuerlich_absetzbar_prozent.
+    """
+    data = config if config is not None else Helper.load_config_yml()
+    steuerjahre = sorted(years if years is not None else data["steuern"]["einkommensteuer"])
+    scenarios = [_scenario(inputs, year, data) for year in steuerjahre]
+
+    points = [(scenario, gehalt) for scenario in scenarios for gehalt in _salary_grid(scenario, data)]
+    vorteile = _pkv_vorteil(points, data)
+
+    brackets: list[tuple[_Scenario, float, float, bool]] = []
+    roots: list[tuple[_Scenario, float, bool]] = []
+    for (scenario, low), (next_scenario, high), v_low, v_high in zip(points, points[1:], vorteile, vorteile[1:]):
+        if scenario is not next_scenario or (v_low > 0) == (v_high > 0):
+            continue
+        brackets.append((scenario, low, high, v_high > 0))
+
+    while brackets:
+        midpoints = [(scenario, (low + high) / 2) for scenario, low, high, _ in brackets]
+        remaining = []
+        for (scenario, low, high, aufwaerts), (_, middle), vorteil in zip(
+            brackets, midpoints, _pkv_vorteil(midpoints, data)
+        ):
+            if (vorteil > 0) == aufwaerts:
+                high = middle
+            else:
+                low = middle
+            if high - low > BREAK_EVEN_PRECISION:
+                remaining.append((scenario, low, high, aufwaerts))
+            else:
+                roots.append((scenario, high, aufwaerts))
+        brackets = remaining
+
+    result: dict[int, list[KvBreakEven]] = {year: [] for year in steuerjahre}
+    for scenario, gehalt, aufwaerts in sorted(roots, key=lambda root: (root[0].steuerjahr, root[1])):
+        result[scenario.steuerjahr].append(
+            KvBreakEven(
+                steuerjahr=scenario.steuerjahr,
+                gf_gehalt=round(gehalt, 2),
+                gesamtes_gf_brutto=round(gehalt + scenario.gkv.andere_einkommen, 2),
+                pkv_guenstiger_ab=aufwaerts,
+            )
+        )
+    return result
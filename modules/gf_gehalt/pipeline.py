@@ -0,0 +1,128 @@
+import heapq
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, fields, replace
+from itertools import count, islice
+
+from modules.gf_gehalt.cache import ReportCache, calculate_business_reports_cached
+from modules.gf_gehalt.service import CalculationInput, calculate_business_reports
+from modules.utils.helper import Helper
+
+Result = tuple[CalculationInput, dict]
+ReportKey = str | Callable[[dict], float]
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+@dataclass(frozen=True)
+class ParameterRange:
+    """Lazy, re-iterable range of floats from start (inclusive) to stop (exclusive)."""
+
+    start: float
+    stop: float
+    step: float
+
+    def __post_init__(self) -> None:
+        if self.step <= 0:
+            raise ValueError("step muss größer als 0 sein!")
+
+    def __iter__(self) -> Iterator[float]:
+        for index in count():
+            value = self.start + index * self.step
+            if value >= self.stop:
+                return
+            yield value
+
+
+def parameter_range(start: float, stop: float, step: float) -> ParameterRange:
+    return ParameterRange(start, stop, step)
+
+
+def _product(axes: list[Iterable]) -> Iterator[tuple]:
+    if not axes:
+        yield ()
+        return
+    for value in axes[0]:
+        for rest in _product(axes[1:]):
+            yield (value, *rest)
+
+
+def scenarios(base: CalculationInput, **ranges: Iterable) -> Iterator[CalculationInput]:
+    """Lazy Cartesian product of parameter ranges applied to base, last range varying fastest.
+
+    The first range is streamed and may be unbounded. The inner ranges are iterated again for every outer
+    value, so one-shot iterators in inner positions are materialised; pass a ParameterRange or another
+    re-iterable to keep a large inner range lazy.
+    """
+    known = {field.name for field in fields(CalculationInput)}
+    unknown = sorted(set(ranges) - known)
+    if unknown:
+        raise ValueError(f"Unbekannte Parameter: {', '.join(unknown)}")
+
+    names = list(ranges)
+    axes = [ranges[name] for name in names]
+    axes[1:] = [list(axis) if isinstance(axis, Iterator) else axis for axis in axes[1:]]
+    for values in _product(axes):
+        yield replace(base, **dict(zip(names, values)))
+
+
+def drop_loss_making(stream: Iterable[CalculationInput]) -> Iterator[CalculationInput]:
+    return (item for item in stream if item.gmbh_umsatz - item.gmbh_kosten - item.gf_gehalt > 0)
+
+
+def evaluate(
+    stream: Iterable[CalculationInput],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    config: dict | None = None,
+    cache: ReportCache | None = None,
+) -> Iterator[Result]:
+    if chunk_size <= 0:
+        raise ValueError("chunk_size muss größer als 0 sein!")
+    data = config if config is not None else Helper.load_config_yml()
+
+    iterator = iter(stream)
+    while chunk := list(islice(iterator, chunk_size)):
+        if cache is not None:
+            reports = calculate_business_reports_cached(chunk, cache, data)
+        else:
+            reports = calculate_business_reports(chunk, data)
+        yield from zip(chunk, reports)
+
+
+def _key_function(key: ReportKey) -> Callable[[dict], float]:
+    if callable(key):
+        return key
+    return lambda report: report[key]
+
+
+def top_k(results: Iterable[Result], k: int, key: ReportKey = "gesamter_nettoerloes") -> list[Result]:
+    """The k results with the largest key, best first; ties keep the earlier result."""
+    if k < 0:
+        raise ValueError("k darf nicht negativ sein!")
+    if k == 0:
+        return []
+    score = _key_function(key)
+    heap: list[tuple[float, int, Result]] = []
+    for index, result in enumerate(results):
+        entry = (score(result[1]), -index, result)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    return [result for _, _, result in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+
+
+def argmax(results: Iterable[Result], key: ReportKey = "gesamter_nettoerloes") -> Result | None:
+    best = top_k(results, 1, key)
+    return best[0] if best else None
+
+
+def histogram(results: Iterable[Result], bins: Sequence[float], key: ReportKey = "gesamter_nettoerloes") -> list[int]:
+    """Counts per bin for sorted bin edges: below bins[0], [bins[i], bins[i + 1]) ..., and from bins[-1] on."""
+    if list(bins) != sorted(bins):
+        raise ValueError("bins müssen aufsteigend sortiert sein!")
+    score = _key_function(key)
+    counts = [0] * (len(bins) + 1)
+    for _, report in results:
+        counts[bisect_right(bins, score(report))] += 1
+    return counts
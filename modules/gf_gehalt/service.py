@@ -1,7 +1,9 @@
 import json
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
+from modules.gf_gehalt.tariff import Tariff, get_tariff
 from modules.utils.helper import Helper
 
 
@@ -22,6 +24,9 @@ class CalculationInput:
     kv_steuerlich_absetzbar_prozent: float = 100
     verheiratet: bool = False
     ehepartner_zve: float = 0
+    kirchensteuer: bool = False
+    kirchensteuer_satz: float = 9
+    ehepartner_kirchensteuer: bool = False
 
 
 def _round2(value: float) -> float:
@@ -55,52 +60,46 @@ def calculate_annual_krankenkassenbeitrag_self_employed(
 
 
 def get_grenzsteuersatz(zve: float, verheiratet: bool, year: int, config: dict) -> float:
-    steuer_config = config["steuern"]["einkommensteuer"]
-    if year not in steuer_config:
-        raise ValueError(f"Steuerjahr {year} ist nicht in der Konfiguration enthalten!")
+    return get_tariff(year, config).grenzsteuersatz(zve, verheiratet)
 
-    tariff = steuer_config[year]
-    taxable_income = zve / 2 if verheiratet else zve
 
-    if taxable_income <= tariff["zone1_start"]:
+def calc_tax(einkommen: float, verheiratet: bool, year: int, config: dict) -> float:
+    return _round2(get_tariff(year, config).einkommensteuer(einkommen, verheiratet))
+
+
+def calc_soli(einkommensteuer: float, verheiratet: bool, year: int, config: dict) -> float:
+    return _round2(get_tariff(year, config).solidaritaetszuschlag(einkommensteuer, verheiratet))
+
+
+def calc_kirchensteuer(einkommensteuer: float, kirchensteuer: bool, kirchensteuer_satz: float) -> float:
+    if not kirchensteuer:
         return 0.0
-    if taxable_income <= tariff["zone2_start"]:
-        return 14 + ((taxable_income - tariff["zone1_start"]) / (tariff["zone2_start"] - tariff["zone1_start"])) * (
-            24 - 14
-        )
-    if taxable_income <= tariff["zone3_start"]:
-        return 24 + ((taxable_income - tariff["zone2_start"]) / (tariff["zone3_start"] - tariff["zone2_start"])) * (
-            42 - 24
-        )
-    if taxable_income <= tariff["zone4_start"]:
-        return 42.0
-    return 45.0
+    return _round2(einkommensteuer * (kirchensteuer_satz / 100))
 
 
-def calc_tax(einkommen: float, verheiratet: bool, year: int, config: dict) -> float:
-    steuer_config = config["steuern"]["einkommensteuer"]
-    if year not in steuer_config:
-        raise ValueError(f"Steuerjahr {year} ist nicht in der Konfiguration enthalten!")
-
-    tariff = steuer_config[year]
-    taxable_income = einkommen / 2 if verheiratet else einkommen
-
-    if taxable_income <= tariff["zone1_start"]:
-        steuer = 0.0
-    elif taxable_income <= tariff["zone2_start"]:
-        y = (taxable_income - tariff["zone1_start"]) / 10000
-        steuer = (tariff["y_factor"] * y + tariff["y_offset"]) * y
-    elif taxable_income <= tariff["zone3_start"]:
-        z = (taxable_income - tariff["zone2_start"]) / 10000
-        steuer = (tariff["z_factor"] * z + tariff["z_offset"]) * z + tariff["z_extra"]
-    elif taxable_income <= tariff["zone4_start"]:
-        steuer = 0.42 * taxable_income - tariff["tax_42_offset"]
-    else:
-        steuer = 0.45 * taxable_income - tariff["tax_45_offset"]
+def calc_kirchensteuer_zusammenveranlagung(
+    einkommensteuer: float, ehegatten: Sequence[tuple[float, bool, float]], tariff: Tariff
+) -> float:
+    """Kirchensteuer of a jointly assessed couple, given (own zvE, kirchensteuerpflichtig, satz) per spouse.
+
+    If both spouses pay church tax, the joint Einkommensteuer is split in halves. Otherwise each paying
+    spouse's share follows the ratio of the Grundtarif taxes on the spouses' own zvE (§ 51a EStG).
+    """
+    if all(pflichtig for _, pflichtig, _ in ehegatten):
+        return sum(calc_kirchensteuer(einkommensteuer / len(ehegatten), True, satz) for _, _, satz in ehegatten)
+
+    grundtarif = [tariff.einkommensteuer(zve, False) for zve, _, _ in ehegatten]
+    gesamt = sum(grundtarif)
+    if gesamt <= 0:
+        return 0.0
+    return sum(
+        calc_kirchensteuer(einkommensteuer * anteil / gesamt, pflichtig, satz)
+        for anteil, (_, pflichtig, satz) in zip(grundtarif, ehegatten)
+    )
+
 
-    if verheiratet:
-        steuer *= 2
-    return _round2(steuer)
+def calc_tax_batch(einkommen: Iterable[float], verheiratet: bool, year: int, config: dict) -> list[float]:
+    return [_round2(steuer) for steuer in get_tariff(year, config).einkommensteuer_batch(einkommen, verheiratet)]
 
 
 def berechne_gewerbesteuer(gewinn: float, hebesatz: float, freibetrag: float = 24500) -> float:
@@ -109,9 +108,17 @@ def berechne_gewerbesteuer(gewinn: float, hebesatz: float, freibetrag: float = 2
     return _round2(messbetrag * (hebesatz / 100))
 
 
-def calculate_business_report(inputs: CalculationInput, config: dict | None = None) -> dict:
-    data = config if config is not None else Helper.load_config_yml()
+@dataclass(frozen=True)
+class ReportBasis:
+    gmbh_gewinn_vor_steuern: float
+    gmbh_steuern_gesamt: float
+    gmbh_gewinn_nach_steuern: float
+    gesamtes_gf_brutto: float
+    gf_krankenkassenbeitrag: float
+    zve: float
+
 
+def report_basis(inputs: CalculationInput, data: dict) -> ReportBasis:
     gmbh_gewinn_vor_steuern = inputs.gmbh_umsatz - inputs.gmbh_kosten - inputs.gf_gehalt
     if gmbh_gewinn_vor_steuern <= 0:
         raise ValueError("Das Unternehmen darf keinen Verlust machen!")
@@ -142,24 +149,58 @@ def calculate_business_report(inputs: CalculationInput, config: dict | None = No
     if inputs.verheiratet:
         zve += inputs.ehepartner_zve
 
-    ekst = calc_tax(zve, inputs.verheiratet, inputs.steuerjahr, data)
-    grenzsteuersatz = get_grenzsteuersatz(zve, inputs.verheiratet, inputs.steuerjahr, data)
-
-    persoenliche_abgabenlast = ekst + gf_krankenkassenbeitrag
-    persoenliches_netto = gesamtes_gf_brutto - persoenliche_abgabenlast
-    gesamter_nettoerloes = persoenliches_netto + gmbh_gewinn_nach_steuern
-    gesamte_abgaben = gmbh_steuern_gesamt + persoenliche_abgabenlast
+    return ReportBasis(
+        gmbh_gewinn_vor_steuern=gmbh_gewinn_vor_steuern,
+        gmbh_steuern_gesamt=gmbh_steuern_gesamt,
+        gmbh_gewinn_nach_steuern=gmbh_gewinn_nach_steuern,
+        gesamtes_gf_brutto=gesamtes_gf_brutto,
+        gf_krankenkassenbeitrag=gf_krankenkassenbeitrag,
+        zve=zve,
+    )
+
+
+def netto_vor_einkommensteuer(basis: ReportBasis) -> float:
+    return basis.gesamtes_gf_brutto - basis.gf_krankenkassenbeitrag + basis.gmbh_gewinn_nach_steuern
+
+
+def _kirchensteuer(inputs: CalculationInput, basis: ReportBasis, ekst: float, tariff: Tariff) -> float:
+    if not inputs.verheiratet:
+        return calc_kirchensteuer(ekst, inputs.kirchensteuer, inputs.kirchensteuer_satz)
+    return calc_kirchensteuer_zusammenveranlagung(
+        ekst,
+        [
+            (basis.zve - inputs.ehepartner_zve, inputs.kirchensteuer, inputs.kirchensteuer_satz),
+            (inputs.ehepartner_zve, inputs.ehepartner_kirchensteuer, inputs.kirchensteuer_satz),
+        ],
+        tariff,
+    )
+
+
+def _build_report(
+    inputs: CalculationInput,
+    basis: ReportBasis,
+    ekst: float,
+    soli: float,
+    kirchensteuer: float,
+    grenzsteuersatz: float,
+) -> dict:
+    persoenliche_abgabenlast = ekst + soli + kirchensteuer + basis.gf_krankenkassenbeitrag
+    persoenliches_netto = basis.gesamtes_gf_brutto - persoenliche_abgabenlast
+    gesamter_nettoerloes = persoenliches_netto + basis.gmbh_gewinn_nach_steuern
+    gesamte_abgaben = basis.gmbh_steuern_gesamt + persoenliche_abgabenlast
     gesamte_abgaben_prozentual = 1 - (gesamter_nettoerloes / inputs.gmbh_umsatz)
 
     return {
         "steuerjahr": inputs.steuerjahr,
-        "gmbh_gewinn_vor_steuern": _round2(gmbh_gewinn_vor_steuern),
-        "gmbh_steuern_gesamt": _round2(gmbh_steuern_gesamt),
-        "gmbh_gewinn_nach_steuern": _round2(gmbh_gewinn_nach_steuern),
-        "gesamtes_gf_brutto": _round2(gesamtes_gf_brutto),
-        "krankenkassenbeitrag": _round2(gf_krankenkassenbeitrag),
-        "zve": _round2(zve),
+        "gmbh_gewinn_vor_steuern": _round2(basis.gmbh_gewinn_vor_steuern),
+        "gmbh_steuern_gesamt": _round2(basis.gmbh_steuern_gesamt),
+        "gmbh_gewinn_nach_steuern": _round2(basis.gmbh_gewinn_nach_steuern),
+        "gesamtes_gf_brutto": _round2(basis.gesamtes_gf_brutto),
+        "krankenkassenbeitrag": _round2(basis.gf_krankenkassenbeitrag),
+        "zve": _round2(basis.zve),
         "einkommensteuer": _round2(ekst),
+        "solidaritaetszuschlag": _round2(soli),
+        "kirchensteuer": _round2(kirchensteuer),
         "grenzsteuersatz": _round2(grenzsteuersatz),
         "persoenliches_netto": _round2(persoenliches_netto),
         "gesamter_nettoerloes": _round2(gesamter_nettoerloes),
@@ -168,6 +209,53 @@ def calculate_business_report(inputs: CalculationInput, config: dict | None = No
     }
 
 
+def calculate_business_report(inputs: CalculationInput, config: dict | None = None) -> dict:
+    data = config if config is not None else Helper.load_config_yml()
+
+    basis = report_basis(inputs, data)
+    tariff = get_tariff(inputs.steuerjahr, data)
+    ekst = _round2(tariff.einkommensteuer(basis.zve, inputs.verheiratet))
+    soli = _round2(tariff.solidaritaetszuschlag(ekst, inputs.verheiratet))
+    kirchensteuer = _kirchensteuer(inputs, basis, ekst, tariff)
+    grenzsteuersatz = tariff.grenzsteuersatz(basis.zve, inputs.verheiratet)
+    return _build_report(inputs, basis, ekst, soli, kirchensteuer, grenzsteuersatz)
+
+
+def calculate_business_reports(inputs: Iterable[CalculationInput], config: dict | None = None) -> list[dict]:
+    data = config if config is not None else Helper.load_config_yml()
+
+    batch = list(inputs)
+    bases = [report_basis(item, data) for item in batch]
+
+    groups: dict[tuple[int, bool], list[int]] = {}
+    for index, item in enumerate(batch):
+        groups.setdefault((item.steuerjahr, item.verheiratet), []).append(index)
+
+    ekst = [0.0] * len(batch)
+    soli = [0.0] * len(batch)
+    kirchensteuer = [0.0] * len(batch)
+    grenzsteuersatz = [0.0] * len(batch)
+    for (year, verheiratet), indices in groups.items():
+        tariff = get_tariff(year, data)
+        zves = [bases[index].zve for index in indices]
+        steuern = [_round2(steuer) for steuer in tariff.einkommensteuer_batch(zves, verheiratet)]
+        for index, steuer, zuschlag, satz in zip(
+            indices,
+            steuern,
+            tariff.solidaritaetszuschlag_batch(steuern, verheiratet),
+            tariff.grenzsteuersatz_batch(zves, verheiratet),
+        ):
+            ekst[index] = steuer
+            soli[index] = _round2(zuschlag)
+            kirchensteuer[index] = _kirchensteuer(batch[index], bases[index], steuer, tariff)
+            grenzsteuersatz[index] = satz
+
+    return [
+        _build_report(item, bases[index], ekst[index], soli[index], kirchensteuer[index], grenzsteuersatz[index])
+        for index, item in enumerate(batch)
+    ]
+
+
 def write_report_artifact(report: dict, output_path: str) -> str:
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,239 @@
+import copy
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+CONTINUITY_TOLERANCE = 1.0
+COMPILED_CACHE_SIZE = 8
+INVERSE_PRECISION = 0.01
+INVERSE_MAX_ZVE = 1e10
+
+
+def _polynomial(coefficients: tuple[float, ...], origin: float, divisor: float) -> Callable[[float], float]:
+    """Horner evaluation in u = (x - origin) / divisor, unrolled for the degrees § 32a EStG uses."""
+    if not coefficients:
+        return lambda x: 0.0
+    if len(coefficients) == 1:
+        constant = coefficients[0]
+        return lambda x: constant
+    if len(coefficients) == 2:
+        c0, c1 = coefficients
+        if origin == 0 and divisor == 1:
+            return lambda x: c1 * x + c0
+        return lambda x: c1 * ((x - origin) / divisor) + c0
+    if len(coefficients) == 3:
+        c0, c1, c2 = coefficients
+
+        def quadratic(x: float) -> float:
+            u = (x - origin) / divisor
+            return (c2 * u + c1) * u + c0
+
+        return quadratic
+
+    def horner(x: float) -> float:
+        u = (x - origin) / divisor
+        result = coefficients[-1]
+        for coefficient in coefficients[-2::-1]:
+            result = result * u + coefficient
+        return result
+
+    return horner
+
+
+@dataclass(frozen=True)
+class TariffZone:
+    start: float
+    origin: float
+    divisor: float
+    coefficients: tuple[float, ...]
+    derivative: tuple[float, ...]
+    tax: Callable[[float], float] = field(init=False, repr=False, compare=False)
+    marginal_rate: Callable[[float], float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "tax", _polynomial(self.coefficients, self.origin, self.divisor))
+        object.__setattr__(self, "marginal_rate", _polynomial(self.derivative, self.origin, self.divisor))
+
+
+@dataclass(frozen=True)
+class SoliRule:
+    freigrenze: float
+    satz: float
+    milderungssatz: float
+
+    def apply(self, einkommensteuer: float, verheiratet: bool) -> float:
+        freigrenze = self.freigrenze * 2 if verheiratet else self.freigrenze
+        if einkommensteuer <= freigrenze:
+            return 0.0
+        return min(einkommensteuer * self.satz, (einkommensteuer - freigrenze) * self.milderungssatz)
+
+
+@dataclass(frozen=True)
+class Tariff:
+    year: int
+    starts: tuple[float, ...]
+    zones: tuple[TariffZone, ...]
+    soli: SoliRule
+    _lookup: tuple[float, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Incomes below the first start fall into the first zone, so its start can be widened to -inf.
+        object.__setattr__(self, "_lookup", (-math.inf, *self.starts[1:]))
+
+    def zone_for(self, taxable_income: float) -> TariffZone:
+        return self.zones[bisect_left(self._lookup, taxable_income) - 1]
+
+    def einkommensteuer(self, zve: float, verheiratet: bool) -> float:
+        taxable_income = zve / 2 if verheiratet else zve
+        steuer = self.zone_for(taxable_income).tax(taxable_income)
+        if verheiratet:
+            steuer *= 2
+        return steuer
+
+    def grenzsteuersatz(self, zve: float, verheiratet: bool) -> float:
+        taxable_income = zve / 2 if verheiratet else zve
+        return self.zone_for(taxable_income).marginal_rate(taxable_income) * 100
+
+    def einkommensteuer_batch(self, zves: Iterable[float], verheiratet: bool) -> list[float]:
+        lookup = self._lookup
+        taxes = [zone.tax for zone in self.zones]
+        if verheiratet:
+            return [taxes[bisect_left(lookup, zve / 2) - 1](zve / 2) * 2 for zve in zves]
+        return [taxes[bisect_left(lookup, zve) - 1](zve) for zve in zves]
+
+    def grenzsteuersatz_batch(self, zves: Iterable[float], verheiratet: bool) -> list[float]:
+        lookup = self._lookup
+        rates = [zone.marginal_rate for zone in self.zones]
+        if verheiratet:
+            return [rates[bisect_left(lookup, zve / 2) - 1](zve / 2) * 100 for zve in zves]
+        return [rates[bisect_left(lookup, zve) - 1](zve) * 100 for zve in zves]
+
+    def solidaritaetszuschlag(self, einkommensteuer: float, verheiratet: bool) -> float:
+        return self.soli.apply(einkommensteuer, verheiratet)
+
+    def zve_for_einkommensteuer(self, einkommensteuer: float, verheiratet: bool) -> float:
+        low, high = 0.0, INVERSE_MAX_ZVE
+        while high - low > INVERSE_PRECISION:
+            middle = (low + high) / 2
+            if self.einkommensteuer(middle, verheiratet) >= einkommensteuer:
+                high = middle
+            else:
+                low = middle
+        return high
+
+    def zve_breakpoints(self, verheiratet: bool) -> list[float]:
+        """zvE values where ESt + Soli is not smooth: the zone starts and both ends of the Milderungszone."""
+        factor = 2 if verheiratet else 1
+        freigrenze = self.soli.freigrenze * factor
+        milderung_ende = self.soli.milderungssatz * freigrenze / (self.soli.milderungssatz - self.soli.satz)
+        breakpoints = [start * factor for start in self.starts]
+        breakpoints += [self.zve_for_einkommensteuer(steuer, verheiratet) for steuer in (freigrenze, milderung_ende)]
+        return sorted(breakpoints)
+
+    def solidaritaetszuschlag_batch(self, einkommensteuern: Iterable[float], verheiratet: bool) -> list[float]:
+        apply = self.soli.apply
+        return [apply(einkommensteuer, verheiratet) for einkommensteuer in einkommensteuern]
+
+
+def _number(value: object, year: int, name: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Steuerjahr {year}: '{name}' muss eine Zahl sein!")
+    return float(value)
+
+
+def _compile_zone(raw: dict, year: int) -> TariffZone:
+    if not isinstance(raw, dict) or "start" not in raw or "coefficients" not in raw:
+        raise ValueError(f"Steuerjahr {year}: Jede Zone benötigt 'start' und 'coefficients'!")
+
+    start = _number(raw["start"], year, "start")
+    origin = _number(raw.get("origin", start), year, "origin")
+    divisor = _number(raw.get("divisor", 1), year, "divisor")
+    if divisor <= 0:
+        raise ValueError(f"Steuerjahr {year}: 'divisor' muss größer als 0 sein!")
+
+    raw_coefficients = raw["coefficients"]
+    if not isinstance(raw_coefficients, list) or not raw_coefficients:
+        raise ValueError(f"Steuerjahr {year}: 'coefficients' muss eine nicht-leere Liste sein!")
+    coefficients = tuple(_number(c, year, "coefficients") for c in raw_coefficients)
+    derivative = tuple(k * c / divisor for k, c in enumerate(coefficients) if k > 0)
+
+    return TariffZone(start=start, origin=origin, divisor=divisor, coefficients=coefficients, derivative=derivative)
+
+
+def _compile_soli(raw: object, year: int) -> SoliRule:
+    if not isinstance(raw, dict):
+        raise ValueError(f"Steuerjahr {year}: 'soli' fehlt in der Konfiguration!")
+
+    rule = SoliRule(
+        freigrenze=_number(raw.get("freigrenze"), year, "soli.freigrenze"),
+        satz=_number(raw.get("satz"), year, "soli.satz"),
+        milderungssatz=_number(raw.get("milderungssatz"), year, "soli.milderungssatz"),
+    )
+    if rule.freigrenze < 0 or rule.satz <= 0 or rule.milderungssatz <= rule.satz:
+        raise ValueError(f"Steuerjahr {year}: Ungültige Soli-Parameter!")
+    return rule
+
+
+def compile_tariff(year: int, raw: dict) -> Tariff:
+    raw_zones = raw.get("zones") if isinstance(raw, dict) else None
+    if not isinstance(raw_zones, list) or not raw_zones:
+        raise ValueError(f"Steuerjahr {year}: 'zones' muss eine nicht-leere Liste sein!")
+
+    zones = tuple(_compile_zone(zone, year) for zone in raw_zones)
+    if any(zone.start <= previous.start for previous, zone in zip(zones, zones[1:])):
+        raise ValueError(f"Steuerjahr {year}: Zonen müssen aufsteigend sortiert sein!")
+    for previous, zone in zip(zones, zones[1:]):
+        if abs(previous.tax(zone.start) - zone.tax(zone.start)) > CONTINUITY_TOLERANCE:
+            raise ValueError(f"Steuerjahr {year}: Tarif ist an der Zonengrenze {zone.start:.0f} nicht stetig!")
+
+    return Tariff(
+        year=year,
+        starts=tuple(zone.start for zone in zones),
+        zones=zones,
+        soli=_compile_soli(raw.get("soli"), year),
+    )
+
+
+def compile_tariffs(config: dict) -> dict[int, Tariff]:
+    steuer_config = config["steuern"]["einkommensteuer"]
+    return {year: compile_tariff(year, raw) for year, raw in steuer_config.items()}
+
+
+# Most recently used first. Entries are matched by content against a private copy of the raw tariff
+# section, so freshly loaded configs reuse earlier compilations. The section seen last is additionally
+# recognised by identity; edit a copy of a config that is already in use rather than the dict itself.
+_COMPILED: list[tuple[dict, dict[int, Tariff]]] = []
+_COMPILED_LOCK = threading.Lock()
+_last_compiled: tuple[dict, dict[int, Tariff]] | None = None
+
+
+def _compiled_tariffs(config: dict) -> dict[int, Tariff]:
+    global _last_compiled
+    steuer_config = config["steuern"]["einkommensteuer"]
+    last = _last_compiled
+    if last is not None and last[0] is steuer_config:
+        return last[1]
+
+    with _COMPILED_LOCK:
+        for index, (snapshot, tariffs) in enumerate(_COMPILED):
+            if snapshot == steuer_config:
+                if index:
+                    _COMPILED.insert(0, _COMPILED.pop(index))
+                _last_compiled = (steuer_config, tariffs)
+                return tariffs
+
+    tariffs = compile_tariffs(config)
+    with _COMPILED_LOCK:
+        _COMPILED.insert(0, (copy.deepcopy(steuer_config), tariffs))
+        del _COMPILED[COMPILED_CACHE_SIZE:]
+        _last_compiled = (steuer_config, tariffs)
+    return tariffs
+
+
+def get_tariff(year: int, config: dict) -> Tariff:
+    tariffs = _compiled_tariffs(config)
+    if year not in tariffs:
+        raise ValueError(f"Steuerjahr {year} ist nicht in der Konfiguration enthalten!")
+    return tariffs[year]
@@ -1,7 +1,15 @@
+from dataclasses import replace
+
 import streamlit as st
+from modules.gf_gehalt import service
+from modules.gf_gehalt.household import HouseholdInput, optimize_household
+from modules.gf_gehalt.kv_vergleich import find_kv_break_even
+from modules.gf_gehalt.service import CalculationInput
+from modules.gf_gehalt.tariff import compile_tariffs, get_tariff
 from modules.utils.helper import Helper
 
 CONFIG = Helper.load_config_yml()
+STEUERJAHRE = sorted(compile_tariffs(CONFIG))
 
 class Steuersachen():
     @staticmethod
@@ -59,28 +67,7 @@ class Steuersachen():
         Rückgabe:
         - Grenzsteuersatz in Prozent (float)
         """
-        steuer_config = CONFIG['steuern']['einkommensteuer']
-
-        if year not in steuer_config:
-            raise ValueError(f"Steuerjahr {year} ist nicht in der Konfiguration enthalten!")
-
-        config = steuer_config[year]
-
-        # Splittingtarif: Einkommen wird halbiert, Grenzsteuersatz bleibt gleich
-        if verheiratet:
-            zve /= 2
-
-        # Bestimmung des Grenzsteuersatzes basierend auf den Steuerzonen
-        if zve <= config["zone1_start"]:
-            return 0.0
-        elif zve <= config["zone2_start"]:
-            return 14 + ((zve - config["zone1_start"]) / (config["zone2_start"] - config["zone1_start"])) * (24 - 14)
-        elif zve <= config["zone3_start"]:
-            return 24 + ((zve - config["zone2_start"]) / (config["zone3_start"] - config["zone2_start"])) * (42 - 24)
-        elif zve <= config["zone4_start"]:
-            return 42.0
-        else:
-            return 45.0  # Reichensteuer
+        return service.get_grenzsteuersatz(zve, verheiratet, year, CONFIG)
 
     @staticmethod
     def calc_tax(einkommen, verheiratet=False, year=2025):
@@ -96,36 +83,7 @@ class Steuersachen():
         - Einkommensteuerbetrag (float)
         """
 
-        steuer_config = CONFIG['steuern']['einkommensteuer']
-
-        if year not in steuer_config:
-            raise ValueError(f"Steuerjahr {year} ist nicht in der Konfiguration enthalten!")
-
-        config = steuer_config[year]
-        
-        # Splittingtarif: Einkommen halbieren, Steuer berechnen und dann verdoppeln
-        if verheiratet:
-            einkommen /= 2
-
-        # Steuerformeln basierend auf der Steuerkonfiguration
-        if einkommen <= config["zone1_start"]:
-            steuer = 0
-        elif einkommen <= config["zone2_start"]:
-            y = (einkommen - config["zone1_start"]) / 10000
-            steuer = (config["y_factor"] * y + config["y_offset"]) * y
-        elif einkommen <= config["zone3_start"]:
-            z = (einkommen - config["zone2_start"]) / 10000
-            steuer = (config["z_factor"] * z + config["z_offset"]) * z + config["z_extra"]
-        elif einkommen <= config["zone4_start"]:
-            steuer = 0.42 * einkommen - config["tax_42_offset"]
-        else:
-            steuer = 0.45 * einkommen - config["tax_45_offset"]
-
-        # Splittingtarif: Steuer verdoppeln
-        if verheiratet:
-            steuer *= 2
-
-        return round(steuer, 2)
+        return service.calc_tax(einkommen, verheiratet, year, CONFIG)
 
     @staticmethod
     def format_currency(value):
@@ -198,7 +156,7 @@ class Steuersachen():
         # Steuerjahr Auswahl
         steuerjahr = st.slider(
             "Steuerjahr",
-            min_value=2020, max_value=2025, step=1, value=2025,
+            min_value=min(STEUERJAHRE), max_value=max(STEUERJAHRE), step=1, value=max(STEUERJAHRE),
             help=CONFIG["hint"]["steuerjahr"]
         )
 
@@ -289,14 +247,56 @@ class Steuersachen():
                 help=CONFIG["hint"]["verheiratet"]
             )
 
+            ehepartner_gf = False
+            ehepartner_zve = 0  # Default to 0 if not married
+            if verheiratet:
+                ehepartner_gf = st.checkbox(
+                    "Ehepartner ist GF einer eigenen GmbH",
+                    help=CONFIG["hint"]["ehepartner_gf"]
+                )
+                if ehepartner_gf:
+                    ehepartner_gmbh_umsatz = st.slider(
+                        "Jahresumsatz GmbH Ehepartner (€)",
+                        min_value=1000, max_value=1000000, step=1000, value=100000,
+                        help=CONFIG["hint"]["gmbh_umsatz"]
+                    )
+                    ehepartner_gmbh_kosten = st.slider(
+                        "Kosten GmbH Ehepartner (€)",
+                        min_value=0, max_value=100000, step=1000, value=10000,
+                        help=CONFIG["hint"]["gmbh_kosten"]
+                    )
+                    ehepartner_gf_gehalt = st.slider(
+                        "GF Gehalt Ehepartner (€)",
+                        min_value=0, max_value=500000, step=1000, value=40000,
+                        help=CONFIG["hint"]["gf_gehalt"]
+                    )
+                else:
+                    ehepartner_zve = st.slider(
+                        "ZvE Ehepartner (€)",
+                        min_value=0, max_value=200000, step=1000, value=0,
+                        help=CONFIG["hint"]["ehepartner_zve"]
+                    )
+
+            kirchensteuerpflichtig = st.checkbox(
+                "Kirchensteuer",
+                help=CONFIG["hint"]["kirchensteuer"]
+            )
+
+            ehepartner_kirchensteuer = False
             if verheiratet:
-                ehepartner_zve = st.slider(
-                    "ZvE Ehepartner (€)",
-                    min_value=0, max_value=200000, step=1000, value=0,
-                    help=CONFIG["hint"]["ehepartner_zve"]
+                ehepartner_kirchensteuer = st.checkbox(
+                    "Ehepartner kirchensteuerpflichtig",
+                    help=CONFIG["hint"]["ehepartner_kirchensteuer"]
+                )
+
+            if kirchensteuerpflichtig or ehepartner_kirchensteuer:
+                kirchensteuer_satz = st.slider(
+                    "Kirchensteuersatz (%)",
+                    min_value=8, max_value=9, step=1, value=9,
+                    help=CONFIG["hint"]["kirchensteuer_satz"]
                 )
             else:
-                ehepartner_zve = 0  # Default to 0 if not married
+                kirchensteuer_satz = 0
 
             # GmbH Ebene
             gmbh_gewinn_vor_steuern = gmbh_umsatz - gmbh_kosten - gf_gehalt
@@ -308,6 +308,18 @@ class Steuersachen():
                 st.error("**Fehler:** Das Unternehmen darf keinen Verlust machen!")
                 return
 
+            ehepartner = None
+            if ehepartner_gf:
+                ehepartner = CalculationInput(
+                    steuerjahr=steuerjahr, gwst_hebesatz=gwst_hebesatz, gmbh_umsatz=ehepartner_gmbh_umsatz,
+                    gmbh_kosten=ehepartner_gmbh_kosten, gf_gehalt=ehepartner_gf_gehalt, sonstige_absetzbare_ausgaben=0,
+                    kirchensteuer=ehepartner_kirchensteuer, kirchensteuer_satz=kirchensteuer_satz,
+                )
+                if ehepartner_gmbh_umsatz - ehepartner_gmbh_kosten - ehepartner_gf_gehalt <= 0:
+                    st.error("**Fehler:** Die GmbH des Ehepartners darf keinen Verlust machen!")
+                    return
+                ehepartner_zve = service.report_basis(ehepartner, CONFIG).zve
+
             if gmbh_gewinn_vor_steuern > 0:
                 gwst = Steuersachen.berechne_gewerbesteuer(gmbh_gewinn_vor_steuern, gwst_hebesatz, freibetrag=0)
                 soli = gmbh_gewinn_vor_steuern * CONFIG['steuern']['flat_tax']['gmbh']['soli']
@@ -332,7 +344,8 @@ class Steuersachen():
             else:
                 gf_krankenkassenbeitrag = beitrag_pkv * 12
 
-            kv_steuerlich_absetzbar = gf_krankenkassenbeitrag * (kv_steuerlich_absetzbar / 100)
+            kv_steuerlich_absetzbar_prozent = kv_steuerlich_absetzbar
+            kv_steuerlich_absetzbar = gf_krankenkassenbeitrag * (kv_steuerlich_absetzbar_prozent / 100)
             zve = gesamtes_gf_brutto - kv_steuerlich_absetzbar - werbekostenpauschale - sonstige_absetzbare_ausgaben
 
             if verheiratet:
@@ -342,11 +355,23 @@ class Steuersachen():
             pretty_print_zve_grenzsteuersatz = round(zve_grenzsteuersatz, 2)
 
             ekst = Steuersachen.calc_tax(zve, verheiratet, steuerjahr)
+            ekst_soli = service.calc_soli(ekst, verheiratet, steuerjahr, CONFIG)
+            if verheiratet:
+                kirchensteuer = service.calc_kirchensteuer_zusammenveranlagung(
+                    ekst,
+                    [
+                        (zve - ehepartner_zve, kirchensteuerpflichtig, kirchensteuer_satz),
+                        (ehepartner_zve, ehepartner_kirchensteuer, kirchensteuer_satz),
+                    ],
+                    get_tariff(steuerjahr, CONFIG),
+                )
+            else:
+                kirchensteuer = service.calc_kirchensteuer(ekst, kirchensteuerpflichtig, kirchensteuer_satz)
 
             persoenlicher_durchschnitts_steuersatz_prozentual = ekst / zve
             pretty_print_persoenlicher_durchschnitts_steuersatz_prozentual = round(persoenlicher_durchschnitts_steuersatz_prozentual * 100, 2)
 
-            persoenliche_abgabenlast = ekst + gf_krankenkassenbeitrag
+            persoenliche_abgabenlast = ekst + ekst_soli + kirchensteuer + gf_krankenkassenbeitrag
             persoenliches_netto = gesamtes_gf_brutto - persoenliche_abgabenlast
             persoenliche_abgabenlast_prozentual = 1 - persoenliches_netto / gesamtes_gf_brutto
             pretty_print_persoenliche_abgabenlast_prozentual = round(persoenliche_abgabenlast_prozentual * 100, 2)
@@ -395,7 +420,9 @@ class Steuersachen():
                 """)
                 
                 st.markdown(f"""
-                Abzug EkSt+Soli: :red[**-{Steuersachen.format_currency(ekst)}**]  
+                Abzug EkSt: :red[**-{Steuersachen.format_currency(ekst)}**]  
+                Abzug Soli: :red[**-{Steuersachen.format_currency(ekst_soli)}**]  
+                Abzug Kirchensteuer: :red[**-{Steuersachen.format_currency(kirchensteuer)}**]  
                 Gezahlte Krankenkassen-Beiträge GF: :red[**-{Steuersachen.format_currency(gf_krankenkassenbeitrag)}**]  
                 Abgaben Gesamt: :red[**{Steuersachen.format_currency(persoenliche_abgabenlast)}**]  
                 """)
@@ -464,6 +491,48 @@ class Steuersachen():
         # Zeige das aktualisierte Summary an
         st.markdown(summary_text)
 
+        eingaben = CalculationInput(
+            steuerjahr=steuerjahr, gwst_hebesatz=gwst_hebesatz, gmbh_umsatz=gmbh_umsatz, gmbh_kosten=gmbh_kosten,
+            gf_gehalt=gf_gehalt, andere_einkommen=andere_einkommen,
+            sonstige_absetzbare_ausgaben=sonstige_absetzbare_ausgaben, gkv=gkv, kv_zusatzbeitrag=kv_zusatzbeitrag,
+            krankentagegeld=krankentagegeld, pv_zuschlag=pv_zuschlag, beitrag_pkv=beitrag_pkv if not gkv else 0,
+            kv_steuerlich_absetzbar_prozent=kv_steuerlich_absetzbar_prozent, verheiratet=verheiratet,
+            ehepartner_zve=ehepartner_zve, kirchensteuer=kirchensteuerpflichtig, kirchensteuer_satz=kirchensteuer_satz,
+            ehepartner_kirchensteuer=ehepartner_kirchensteuer,
+        )
+
+        if not gkv:
+            st.subheader("GKV vs. PKV")
+            standard = CalculationInput()
+            vergleich = replace(
+                eingaben, kv_zusatzbeitrag=standard.kv_zusatzbeitrag,
+                krankentagegeld=standard.krankentagegeld, pv_zuschlag=standard.pv_zuschlag,
+            )
+            break_evens = find_kv_break_even(vergleich, years=[steuerjahr], config=CONFIG)[steuerjahr]
+            if not break_evens:
+                st.markdown("Im gesamten Gehaltsbereich gibt es keinen Punkt, an dem PKV und GKV gleichauf liegen.")
+            for break_even in break_evens:
+                vorteil = "PKV" if break_even.pkv_guenstiger_ab else "GKV"
+                st.markdown(f"""
+                Ab einem GF Gehalt von **{Steuersachen.format_currency(break_even.gf_gehalt)}** ist die **{vorteil}**
+                nach Steuern günstiger (GKV mit {standard.kv_zusatzbeitrag} % Zusatzbeitrag, Krankentagegeld und PV-Zuschlag).
+                """)
+
+        if verheiratet:
+            st.subheader("Haushaltsoptimierung (Splitting)")
+            st.markdown("""
+            Optimiert das GF-Gehalt gemeinsam für beide Ehepartner. Ist der Ehepartner selbst GF einer GmbH, werden beide Gehälter
+            gleichzeitig optimiert, sonst wird das ZvE des Ehepartners als fest angenommen.
+            """)
+            if st.button("Gehälter optimieren"):
+                optimum = optimize_household(HouseholdInput(partner_a=eingaben, partner_b=ehepartner), CONFIG)
+                st.markdown(f"""
+                Optimales GF Gehalt: **{Steuersachen.format_currency(optimum.gf_gehalt_a)}**  
+                {f"Optimales GF Gehalt Ehepartner: **{Steuersachen.format_currency(optimum.gf_gehalt_b)}**  " if optimum.gf_gehalt_b is not None else ""}
+                Nettoerlös Haushalt: **:green[{Steuersachen.format_currency(optimum.report['gesamter_nettoerloes'])}]**  
+                Gemeinsames ZvE: **{Steuersachen.format_currency(optimum.report['zve'])}**  
+                """)
+
         # Add footer with Impressum link
         st.markdown("""
         ---
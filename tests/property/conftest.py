@@ -0,0 +1,23 @@
+import os
+from collections.abc import Iterator
+
+import pytest
+from hypothesis import HealthCheck, settings
+
+from modules.gf_gehalt.cache import ReportCache
+
+settings.register_profile("ci", max_examples=100, deadline=None)
+settings.register_profile(
+    "nightly",
+    max_examples=20000,
+    deadline=None,
+    suppress_health_check=[HealthCheck.too_slow],
+)
+settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "ci"))
+
+
+@pytest.fixture(scope="session")
+def report_cache(tmp_path_factory: pytest.TempPathFactory) -> Iterator[ReportCache]:
+    cache = ReportCache(str(tmp_path_factory.mktemp("cache") / "reports.sqlite"), max_entries=500)
+    yield cache
+    cache.close()
@@ -0,0 +1,161 @@
+from dataclasses import replace
+
+import pytest
+from hypothesis import assume, given
+from hypothesis import strategies as st
+
+from modules.gf_gehalt.cache import ReportCache, calculate_business_reports_cached
+from modules.gf_gehalt.pipeline import evaluate
+from modules.gf_gehalt.service import (
+    CalculationInput,
+    calc_tax,
+    calc_tax_batch,
+    calculate_business_report,
+    calculate_business_reports,
+    get_grenzsteuersatz,
+)
+from modules.gf_gehalt.tariff import compile_tariffs, get_tariff
+from modules.utils.helper import Helper
+
+CONFIG = Helper.load_config_yml()
+YEARS = sorted(CONFIG["steuern"]["einkommensteuer"])
+
+# The shipped tariffs jump by at most 0.0941 € at a zone boundary (2025, at 68480); Splitting doubles it.
+TARIFF_JUMP = 0.10
+CENT = 0.01
+
+
+def _jump_tolerance(verheiratet: bool) -> float:
+    return TARIFF_JUMP * (2 if verheiratet else 1) + CENT
+
+
+years = st.sampled_from(YEARS)
+euros = st.integers(min_value=0, max_value=50_000_000).map(lambda cents: cents / 100)
+zves = st.integers(min_value=-1_000_000, max_value=200_000_000).map(lambda cents: cents / 100)
+
+
+@st.composite
+def calculation_inputs(draw: st.DrawFn) -> CalculationInput:
+    gmbh_kosten = draw(euros)
+    gf_gehalt = draw(euros)
+    gewinn = draw(st.integers(min_value=1, max_value=100_000_000).map(lambda cents: cents / 100))
+    verheiratet = draw(st.booleans())
+    return CalculationInput(
+        steuerjahr=draw(years),
+        gwst_hebesatz=draw(st.integers(min_value=200, max_value=900)),
+        gmbh_umsatz=gmbh_kosten + gf_gehalt + gewinn,
+        gmbh_kosten=gmbh_kosten,
+        gf_gehalt=gf_gehalt,
+        andere_einkommen=draw(euros),
+        sonstige_absetzbare_ausgaben=draw(euros),
+        gkv=draw(st.booleans()),
+        kv_zusatzbeitrag=draw(st.integers(min_value=0, max_value=500).map(lambda bp: bp / 100)),
+        krankentagegeld=draw(st.booleans()),
+        pv_zuschlag=draw(st.booleans()),
+        beitrag_pkv=draw(st.integers(min_value=0, max_value=300_000).map(lambda cents: cents / 100)),
+        kv_steuerlich_absetzbar_prozent=draw(st.integers(min_value=0, max_value=100)),
+        verheiratet=verheiratet,
+        ehepartner_zve=draw(euros) if verheiratet else 0,
+        kirchensteuer=draw(st.booleans()),
+        kirchensteuer_satz=draw(st.sampled_from([8, 9])),
+        ehepartner_kirchensteuer=draw(st.booleans()),
+    )
+
+
+@given(st.lists(calculation_inputs(), max_size=25))
+def test_batch_path_matches_scalar_reference(inputs: list[CalculationInput]) -> None:
+    assert calculate_business_reports(inputs, CONFIG) == [calculate_business_report(i, CONFIG) for i in inputs]
+
+
+@given(st.lists(calculation_inputs(), max_size=25))
+def test_cached_path_matches_scalar_reference(report_cache: ReportCache, inputs: list[CalculationInput]) -> None:
+    expected = [calculate_business_report(i, CONFIG) for i in inputs]
+
+    assert calculate_business_reports_cached(inputs, report_cache, CONFIG) == expected
+    assert calculate_business_reports_cached(inputs, report_cache, CONFIG) == expected
+
+
+@given(st.lists(calculation_inputs(), max_size=25), st.integers(min_value=1, max_value=10))
+def test_chunked_pipeline_matches_scalar_reference(inputs: list[CalculationInput], chunk_size: int) -> None:
+    assert list(evaluate(iter(inputs), chunk_size=chunk_size, config=CONFIG)) == [
+        (i, calculate_business_report(i, CONFIG)) for i in inputs
+    ]
+
+
+@given(years, st.booleans(), st.lists(zves, max_size=50))
+def test_tariff_batch_matches_scalar(year: int, verheiratet: bool, values: list[float]) -> None:
+    assert calc_tax_batch(values, verheiratet, year, CONFIG) == [calc_tax(v, verheiratet, year, CONFIG) for v in values]
+
+    tariff = get_tariff(year, CONFIG)
+    assert tariff.grenzsteuersatz_batch(values, verheiratet) == [
+        get_grenzsteuersatz(v, verheiratet, year, CONFIG) for v in values
+    ]
+
+
+@given(calculation_inputs())
+def test_report_balances_to_the_cent(inputs: CalculationInput) -> None:
+    report = calculate_business_report(inputs, CONFIG)
+
+    verfuegbar = inputs.gmbh_umsatz - inputs.gmbh_kosten + inputs.andere_einkommen
+    assert report["gesamter_nettoerloes"] + report["gesamte_abgaben"] == pytest.approx(verfuegbar, abs=0.02)
+    assert 0 <= report["solidaritaetszuschlag"] <= report["einkommensteuer"] * 0.055 + 0.01
+
+
+@given(years, st.data(), st.floats(min_value=0, max_value=1))
+def test_calc_tax_is_continuous_at_zone_boundaries(year: int, data: st.DataObject, offset: float) -> None:
+    tariff = get_tariff(year, CONFIG)
+    boundary = data.draw(st.sampled_from(tariff.starts[1:]))
+
+    below = calc_tax(boundary, False, year, CONFIG)
+    above = calc_tax(boundary + offset, False, year, CONFIG)
+    assert abs(above - below) <= 0.45 * offset + _jump_tolerance(False)
+
+
+@given(years, st.booleans(), zves, zves)
+def test_calc_tax_is_monotonic(year: int, verheiratet: bool, a: float, b: float) -> None:
+    low, high = sorted((a, b))
+    tolerance = _jump_tolerance(verheiratet)
+    assert calc_tax(low, verheiratet, year, CONFIG) <= calc_tax(high, verheiratet, year, CONFIG) + tolerance
+
+
+@given(years, st.integers(min_value=0, max_value=100_000_000).map(lambda cents: cents / 100))
+def test_splitting_doubles_half_income_tax(year: int, zve: float) -> None:
+    einzel = calc_tax(zve, False, year, CONFIG)
+    assert calc_tax(2 * zve, True, year, CONFIG) == pytest.approx(2 * einzel, abs=0.011)
+
+
+@given(years, st.floats(min_value=1, max_value=2_000_000))
+def test_grenzsteuersatz_matches_finite_difference(year: int, zve: float) -> None:
+    tariff = get_tariff(year, CONFIG)
+    step = 0.5
+    assume(all(abs(zve - start) > step for start in tariff.starts))
+
+    slope = (tariff.einkommensteuer(zve + step, False) - tariff.einkommensteuer(zve - step, False)) / (2 * step)
+    assert tariff.grenzsteuersatz(zve, False) == pytest.approx(slope * 100, abs=1e-6)
+
+
+@given(years, st.booleans(), st.floats(min_value=0, max_value=500_000))
+def test_soli_is_continuous(year: int, verheiratet: bool, einkommensteuer: float) -> None:
+    tariff = get_tariff(year, CONFIG)
+    step = 0.01
+
+    jump = tariff.solidaritaetszuschlag(einkommensteuer + step, verheiratet) - tariff.solidaritaetszuschlag(
+        einkommensteuer, verheiratet
+    )
+    assert 0 <= jump <= tariff.soli.milderungssatz * step + 1e-9
+
+
+@given(calculation_inputs(), st.integers(min_value=0, max_value=10_000_000).map(lambda cents: cents / 100))
+def test_higher_salary_never_lowers_personal_tax(inputs: CalculationInput, raise_by: float) -> None:
+    higher = replace(inputs, gf_gehalt=inputs.gf_gehalt + raise_by, gmbh_umsatz=inputs.gmbh_umsatz + raise_by)
+    low = calculate_business_report(inputs, CONFIG)
+    high = calculate_business_report(higher, CONFIG)
+
+    assert high["zve"] >= low["zve"] - 0.01
+    assert high["einkommensteuer"] >= low["einkommensteuer"] - _jump_tolerance(inputs.verheiratet)
+
+
+def test_shipped_tariffs_stay_within_jump_tolerance() -> None:
+    for tariff in compile_tariffs(CONFIG).values():
+        for previous, zone in zip(tariff.zones, tariff.zones[1:]):
+            assert abs(zone.tax(zone.start) - previous.tax(zone.start)) <= TARIFF_JUMP
@@ -0,0 +1,109 @@
+import multiprocessing
+from dataclasses import replace
+
+from modules.gf_gehalt import cache as cache_module
+from modules.gf_gehalt.cache import (
+    ReportCache,
+    calculate_business_report_cached,
+    calculate_business_reports_cached,
+    config_fingerprint,
+    default_report_cache,
+    input_key,
+)
+from modules.gf_gehalt.service import CalculationInput, calculate_business_report
+from modules.utils.helper import Helper
+
+CONFIG = Helper.load_config_yml()
+
+
+def _fill_cache(path: str, offset: int) -> None:
+    cache = ReportCache(path)
+    inputs = [CalculationInput(gf_gehalt=1000 * (offset + i)) for i in range(50)]
+    calculate_business_reports_cached(inputs, cache, CONFIG)
+    cache.close()
+
+
+def test_input_key_is_canonical() -> None:
+    assert input_key(CalculationInput(gf_gehalt=30000)) == input_key(CalculationInput(gf_gehalt=30000.0))
+    assert input_key(CalculationInput(gf_gehalt=30000)) != input_key(CalculationInput(gf_gehalt=30001))
+
+
+def test_config_fingerprint_changes_with_tax_rules() -> None:
+    changed = {**CONFIG, "steuern": {**CONFIG["steuern"], "werbungskostenpauschale": {2025: 1}}}
+    assert config_fingerprint(CONFIG) == config_fingerprint(dict(CONFIG))
+    assert config_fingerprint(CONFIG) != config_fingerprint(changed)
+
+
+def test_cached_reports_survive_restart(tmp_path) -> None:
+    path = str(tmp_path / "reports.sqlite")
+    inputs = [CalculationInput(), CalculationInput(steuerjahr=2022, gf_gehalt=80000, gkv=False, kirchensteuer=True)]
+
+    cache = ReportCache(path)
+    assert cache.get_many(inputs, CONFIG) == [None, None]
+    reports = calculate_business_reports_cached(inputs, cache, CONFIG)
+    cache.close()
+
+    restarted = ReportCache(path)
+    assert restarted.get_many(inputs, CONFIG) == reports
+    assert reports == [calculate_business_report(i, CONFIG) for i in inputs]
+    assert calculate_business_report_cached(inputs[0], restarted, CONFIG) == reports[0]
+
+
+def test_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = ReportCache(str(tmp_path / "reports.sqlite"), max_entries=3, touch_after=0)
+    inputs = [CalculationInput(gf_gehalt=gehalt) for gehalt in (10000, 20000, 30000)]
+    calculate_business_reports_cached(inputs, cache, CONFIG)
+
+    assert cache.get(inputs[0], CONFIG) is not None
+    calculate_business_report_cached(replace(inputs[0], gf_gehalt=40000), cache, CONFIG)
+
+    assert len(cache) == 3
+    assert cache.get(inputs[0], CONFIG) is not None
+    assert cache.get(inputs[1], CONFIG) is None
+
+
+def test_cache_hits_only_touch_stale_rows(tmp_path) -> None:
+    cache = ReportCache(str(tmp_path / "reports.sqlite"), touch_after=3600)
+    inputs = [CalculationInput(gf_gehalt=gehalt) for gehalt in (10000, 20000)]
+    calculate_business_reports_cached(inputs, cache, CONFIG)
+
+    def accessed() -> list[float]:
+        return [row[0] for row in cache._connect().execute("SELECT accessed FROM reports ORDER BY accessed")]
+
+    before = accessed()
+    assert cache.get_many(inputs, CONFIG) == [calculate_business_report(i, CONFIG) for i in inputs]
+    assert accessed() == before
+
+    cache.touch_after = -1
+    cache.get_many(inputs[:1], CONFIG)
+    assert accessed()[-1] > before[-1]
+
+
+def test_cache_is_shared_between_processes(tmp_path) -> None:
+    path = str(tmp_path / "reports.sqlite")
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_fill_cache, args=(path, offset)) for offset in (0, 25, 50, 75)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    assert len(ReportCache(path)) == 125
+
+
+def test_report_cache_path_enables_default_cache(tmp_path, monkeypatch) -> None:
+    inputs = [CalculationInput(gf_gehalt=45000)]
+    monkeypatch.setattr(cache_module, "_default_cache", None)
+    monkeypatch.setattr(cache_module, "REPORT_CACHE_PATH", None)
+    assert default_report_cache() is None
+    assert calculate_business_reports_cached(inputs, config=CONFIG) == [calculate_business_report(inputs[0], CONFIG)]
+
+    path = str(tmp_path / "reports.sqlite")
+    monkeypatch.setattr(cache_module, "REPORT_CACHE_PATH", path)
+    cache = default_report_cache()
+    assert cache is not None and cache is default_report_cache()
+    reports = calculate_business_reports_cached(inputs, config=CONFIG)
+    cache.close()
+
+    assert ReportCache(path).get_many(inputs, CONFIG) == reports
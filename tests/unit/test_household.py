@@ -0,0 +1,95 @@
+from dataclasses import replace
+
+import pytest
+
+from modules.gf_gehalt.household import HouseholdInput, calculate_household_report, optimize_household
+from modules.gf_gehalt.service import CalculationInput, calculate_business_report
+from modules.gf_gehalt.tariff import get_tariff
+from modules.utils.helper import Helper
+
+CONFIG = Helper.load_config_yml()
+
+
+def _grid_optimum(household: HouseholdInput, steps: int = 40) -> float:
+    def gehaelter(partner: CalculationInput) -> list[int]:
+        maximum = int(partner.gmbh_umsatz - partner.gmbh_kosten) - 1
+        return [round(maximum * i / steps) for i in range(steps + 1)]
+
+    partner_b = household.partner_b
+    return max(
+        calculate_household_report(
+            HouseholdInput(
+                replace(household.partner_a, gf_gehalt=a),
+                replace(partner_b, gf_gehalt=b) if partner_b is not None and b is not None else None,
+            ),
+            CONFIG,
+        )["gesamter_nettoerloes"]
+        for a in gehaelter(household.partner_a)
+        for b in (gehaelter(partner_b) if partner_b is not None else [None])
+    )
+
+
+@pytest.mark.parametrize(("kirchensteuer", "ehepartner_kirchensteuer"), [(False, False), (True, False), (True, True)])
+def test_household_with_employed_spouse_matches_business_report(
+    kirchensteuer: bool, ehepartner_kirchensteuer: bool
+) -> None:
+    partner = CalculationInput(
+        gf_gehalt=60000,
+        gmbh_umsatz=200000,
+        ehepartner_zve=45000,
+        kirchensteuer=kirchensteuer,
+        ehepartner_kirchensteuer=ehepartner_kirchensteuer,
+    )
+    household = calculate_household_report(HouseholdInput(partner), CONFIG)
+    single = calculate_business_report(replace(partner, verheiratet=True), CONFIG)
+
+    assert household["zve"] == single["zve"]
+    assert household["einkommensteuer"] == single["einkommensteuer"]
+    assert household["kirchensteuer"] == single["kirchensteuer"]
+    assert household["gesamter_nettoerloes"] == pytest.approx(single["gesamter_nettoerloes"], abs=0.01)
+    assert household["partner_b"] is None
+
+
+def test_household_report_splits_kirchensteuer_by_grundtarif_ratio() -> None:
+    household = HouseholdInput(
+        CalculationInput(gf_gehalt=90000, gmbh_umsatz=200000, kirchensteuer=True),
+        CalculationInput(gf_gehalt=30000, gmbh_umsatz=200000),
+    )
+    report = calculate_household_report(household, CONFIG)
+
+    tariff = get_tariff(2025, CONFIG)
+    grundtarif_a = tariff.einkommensteuer(report["partner_a"]["zve"], False)
+    grundtarif_b = tariff.einkommensteuer(report["partner_b"]["zve"], False)
+    anteil = grundtarif_a / (grundtarif_a + grundtarif_b)
+    assert report["kirchensteuer"] == pytest.approx(report["einkommensteuer"] * anteil * 0.09, abs=0.01)
+
+    beide = calculate_household_report(
+        HouseholdInput(household.partner_a, replace(household.partner_b, kirchensteuer=True)), CONFIG
+    )
+    assert beide["kirchensteuer"] == pytest.approx(beide["einkommensteuer"] * 0.09, abs=0.01)
+
+
+def test_household_rejects_different_tax_years() -> None:
+    household = HouseholdInput(CalculationInput(steuerjahr=2024), CalculationInput(steuerjahr=2025))
+
+    with pytest.raises(ValueError, match="selben Steuerjahr"):
+        calculate_household_report(household, CONFIG)
+
+
+@pytest.mark.parametrize(
+    "household",
+    [
+        HouseholdInput(CalculationInput(), CalculationInput(gmbh_umsatz=90000, gmbh_kosten=10000, gwst_hebesatz=450)),
+        HouseholdInput(
+            CalculationInput(gmbh_umsatz=400000, gkv=False),
+            CalculationInput(gmbh_umsatz=60000, kirchensteuer=True),
+        ),
+        HouseholdInput(CalculationInput(gmbh_umsatz=250000, ehepartner_zve=80000)),
+    ],
+)
+def test_optimize_household_beats_salary_grid(household: HouseholdInput) -> None:
+    optimum = optimize_household(household, CONFIG)
+
+    assert optimum.report["gesamter_nettoerloes"] >= _grid_optimum(household) - 0.05
+    assert optimum.evaluations < 500
+    assert (optimum.gf_gehalt_b is None) == (household.partner_b is None)
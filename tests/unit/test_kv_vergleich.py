@@ -0,0 +1,43 @@
+from dataclasses import replace
+
+import pytest
+
+from modules.gf_gehalt.kv_vergleich import find_kv_break_even
+from modules.gf_gehalt.service import CalculationInput, calculate_business_report
+from modules.utils.helper import Helper
+
+CONFIG = Helper.load_config_yml()
+
+
+def _pkv_vorteil(inputs: CalculationInput, gehalt: float) -> float:
+    pkv = calculate_business_report(replace(inputs, gkv=False, gf_gehalt=gehalt), CONFIG)
+    gkv = calculate_business_report(
+        replace(inputs, gkv=True, kv_steuerlich_absetzbar_prozent=100, gf_gehalt=gehalt), CONFIG
+    )
+    return pkv["gesamter_nettoerloes"] - gkv["gesamter_nettoerloes"]
+
+
+def test_break_even_for_all_years_matches_kv_rate() -> None:
+    inputs = CalculationInput(gmbh_umsatz=300000, beitrag_pkv=600)
+    result = find_kv_break_even(inputs, config=CONFIG)
+
+    assert sorted(result) == sorted(CONFIG["steuern"]["einkommensteuer"])
+    for year, break_evens in result.items():
+        assert len(break_evens) == 1
+        assert break_evens[0].pkv_guenstiger_ab
+        # Both contributions are fully deductible, so taxes cancel at 12 * 600 / 21.25 %.
+        assert break_evens[0].gf_gehalt == pytest.approx(600 * 12 / 0.2125, abs=0.1)
+
+
+def test_break_even_with_partially_deductible_pkv() -> None:
+    inputs = CalculationInput(gmbh_umsatz=300000, beitrag_pkv=700, kv_steuerlich_absetzbar_prozent=60)
+    [break_even] = find_kv_break_even(inputs, years=[2025], config=CONFIG)[2025]
+
+    assert break_even.gf_gehalt > 700 * 12 / 0.2125
+    assert _pkv_vorteil(inputs, break_even.gf_gehalt - 5) < 0 < _pkv_vorteil(inputs, break_even.gf_gehalt + 5)
+
+
+def test_no_break_even_when_pkv_always_more_expensive() -> None:
+    inputs = CalculationInput(gmbh_umsatz=300000, beitrag_pkv=2000)
+
+    assert find_kv_break_even(inputs, years=[2024, 2025], config=CONFIG) == {2024: [], 2025: []}
@@ -0,0 +1,98 @@
+import tracemalloc
+from itertools import islice, tee
+
+import pytest
+
+from modules.gf_gehalt import cache as cache_module
+from modules.gf_gehalt.pipeline import (
+    argmax,
+    drop_loss_making,
+    evaluate,
+    histogram,
+    parameter_range,
+    scenarios,
+    top_k,
+)
+from modules.gf_gehalt.service import CalculationInput, calculate_business_report
+from modules.utils.helper import Helper
+
+CONFIG = Helper.load_config_yml()
+
+
+def test_parameter_range_is_lazy_and_exclusive() -> None:
+    assert list(parameter_range(0, 1, 0.25)) == [0, 0.25, 0.5, 0.75]
+    assert list(islice(parameter_range(0, float("inf"), 1), 3)) == [0, 1, 2]
+
+    with pytest.raises(ValueError, match="step"):
+        list(parameter_range(0, 1, 0))
+
+
+def test_scenarios_are_a_lazy_cartesian_product() -> None:
+    tracemalloc.start()
+    huge = scenarios(
+        CalculationInput(), gf_gehalt=parameter_range(0, 10**8, 1), gwst_hebesatz=parameter_range(200, 10**8, 1)
+    )
+    first = list(islice(huge, 3))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert [(s.gf_gehalt, s.gwst_hebesatz) for s in first] == [(0, 200), (0, 201), (0, 202)]
+    assert peak < 1_000_000
+
+    unbounded = scenarios(CalculationInput(), gf_gehalt=parameter_range(0, float("inf"), 1), verheiratet=[False, True])
+    assert [(s.gf_gehalt, s.verheiratet) for s in islice(unbounded, 3)] == [(0, False), (0, True), (1, False)]
+
+    one_shot = scenarios(CalculationInput(), gf_gehalt=[1, 2], gwst_hebesatz=(h for h in (300, 400)))
+    assert [(s.gf_gehalt, s.gwst_hebesatz) for s in one_shot] == [(1, 300), (1, 400), (2, 300), (2, 400)]
+
+    with pytest.raises(ValueError, match="Unbekannte Parameter"):
+        next(scenarios(CalculationInput(), gehalt=[1]))
+
+
+def test_drop_loss_making_filters_before_evaluation() -> None:
+    stream = scenarios(CalculationInput(gmbh_umsatz=50000, gmbh_kosten=10000), gf_gehalt=[10000, 39999, 40000, 50000])
+
+    assert [s.gf_gehalt for s in drop_loss_making(stream)] == [10000, 39999]
+
+
+def test_chunked_evaluation_matches_reference() -> None:
+    stream = drop_loss_making(
+        scenarios(CalculationInput(), steuerjahr=[2023, 2025], gf_gehalt=parameter_range(0, 200000, 10000))
+    )
+    results = list(evaluate(stream, chunk_size=7, config=CONFIG))
+
+    assert len(results) == 32
+    assert all(item.gf_gehalt < 155000 for item, _ in results)
+    assert all(report == calculate_business_report(item, CONFIG) for item, report in results)
+
+
+def test_reducers_aggregate_on_the_fly() -> None:
+    stream = scenarios(CalculationInput(), gf_gehalt=parameter_range(0, 150000, 5000))
+    for_top, for_best, for_histogram = tee(evaluate(stream, chunk_size=4, config=CONFIG), 3)
+    results = [
+        (item, calculate_business_report(item, CONFIG))
+        for item in scenarios(CalculationInput(), gf_gehalt=parameter_range(0, 150000, 5000))
+    ]
+    ranked = sorted(results, key=lambda result: result[1]["gesamter_nettoerloes"], reverse=True)
+
+    assert top_k(for_top, 3) == ranked[:3]
+    assert argmax(for_best, key=lambda report: -report["gesamte_abgaben"]) == ranked[0]
+    assert sum(histogram(for_histogram, bins=[110000, 115000, 120000])) == len(results)
+    assert argmax([]) is None
+
+
+def test_top_k_validates_k() -> None:
+    results = [(CalculationInput(), calculate_business_report(CalculationInput(), CONFIG))]
+
+    assert top_k(results, 0) == []
+    with pytest.raises(ValueError, match="k darf nicht negativ"):
+        top_k(results, -1)
+
+
+def test_evaluate_uses_only_an_explicit_cache(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "reports.sqlite"
+    monkeypatch.setattr(cache_module, "_default_cache", None)
+    monkeypatch.setattr(cache_module, "REPORT_CACHE_PATH", str(path))
+
+    assert len(list(evaluate([CalculationInput()], config=CONFIG))) == 1
+    assert not path.exists()
@@ -1,4 +1,4 @@
-from modules.gf_gehalt.service import CalculationInput, calculate_business_report
+from modules.gf_gehalt.service import CalculationInput, calculate_business_report, calculate_business_reports
 from modules.utils.helper import Helper
 
 
@@ -33,3 +33,22 @@ def test_yaml_include_loader(tmp_path) -> None:
 
     data = Helper.load_yaml(str(parent))
     assert data["child"]["value"] == 42
+
+
+def test_calculate_business_report_soli_and_kirchensteuer() -> None:
+    report = calculate_business_report(
+        CalculationInput(gmbh_umsatz=300000, gf_gehalt=150000, kirchensteuer=True, kirchensteuer_satz=8)
+    )
+
+    assert report["einkommensteuer"] == 43567.59
+    assert report["solidaritaetszuschlag"] == 2396.22
+    assert report["kirchensteuer"] == 3485.41
+    assert report["persoenliches_netto"] == 86493.9
+
+
+def test_soli_milderungszone_in_scalar_and_batch_path() -> None:
+    inputs = [CalculationInput(gmbh_umsatz=300000, gf_gehalt=gehalt) for gehalt in (90000, 95000, 100000)]
+    reports = calculate_business_reports(inputs)
+
+    assert [r["solidaritaetszuschlag"] for r in reports] == [0.0, 61.59, 311.49]
+    assert reports == [calculate_business_report(i) for i in inputs]
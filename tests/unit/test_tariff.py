@@ -0,0 +1,121 @@
+import copy
+
+import pytest
+
+from modules.gf_gehalt import tariff as tariff_module
+from modules.gf_gehalt.service import (
+    CalculationInput,
+    calc_tax,
+    calc_tax_batch,
+    calculate_business_report,
+    calculate_business_reports,
+    get_grenzsteuersatz,
+)
+from modules.gf_gehalt.tariff import COMPILED_CACHE_SIZE, compile_tariff, get_tariff
+from modules.utils.helper import Helper
+
+CONFIG = Helper.load_config_yml()
+
+
+def test_calc_tax_matches_paragraph_32a_formulas_2025() -> None:
+    assert calc_tax(12096, False, 2025, CONFIG) == 0.0
+    assert calc_tax(15000, False, 2025, CONFIG) == 485.18
+    assert calc_tax(40000, False, 2025, CONFIG) == 7320.82
+    assert calc_tax(100000, False, 2025, CONFIG) == 31088.08
+    assert calc_tax(300000, False, 2025, CONFIG) == 115753.33
+    assert calc_tax(80000, True, 2025, CONFIG) == 2 * calc_tax(40000, False, 2025, CONFIG)
+
+
+def test_calc_tax_uses_2024_tariff() -> None:
+    assert calc_tax(11784, False, 2024, CONFIG) == 0.0
+    assert calc_tax(17005, False, 2024, CONFIG) == 991.21
+    assert calc_tax(40000, False, 2024, CONFIG) == 7461.19
+    assert calc_tax(300000, False, 2024, CONFIG) == 116028.94
+
+
+def test_grenzsteuersatz_is_tariff_derivative() -> None:
+    assert get_grenzsteuersatz(10000, False, 2025, CONFIG) == 0.0
+    assert get_grenzsteuersatz(12096.01, False, 2025, CONFIG) == pytest.approx(14.0, abs=0.01)
+    assert get_grenzsteuersatz(68480, False, 2025, CONFIG) == pytest.approx(42.0, abs=0.01)
+    assert get_grenzsteuersatz(100000, False, 2025, CONFIG) == pytest.approx(42.0)
+    assert get_grenzsteuersatz(600000, True, 2025, CONFIG) == pytest.approx(45.0)
+
+
+def test_batch_engines_match_scalar() -> None:
+    zves = [-500, 0, 12096, 12097, 17443, 17444, 55555.55, 68480, 277825, 277826, 1_000_000]
+    for year in CONFIG["steuern"]["einkommensteuer"]:
+        for verheiratet in (False, True):
+            expected = [calc_tax(zve, verheiratet, year, CONFIG) for zve in zves]
+            assert calc_tax_batch(zves, verheiratet, year, CONFIG) == expected
+
+    inputs = [
+        CalculationInput(),
+        CalculationInput(steuerjahr=2021, gf_gehalt=90000, gkv=False, verheiratet=True, ehepartner_zve=20000),
+        CalculationInput(steuerjahr=2023, gf_gehalt=150000, andere_einkommen=200000),
+    ]
+    assert calculate_business_reports(inputs, CONFIG) == [calculate_business_report(i, CONFIG) for i in inputs]
+
+
+def test_new_tariff_year_is_config_only() -> None:
+    config = copy.deepcopy(CONFIG)
+    steuern = config["steuern"]
+    steuern["einkommensteuer"][2026] = {
+        "zones": [
+            {"start": 0, "coefficients": [0]},
+            {"start": 12348, "divisor": 10000, "coefficients": [0, 1400, 914.51]},
+            {"start": 17799, "divisor": 10000, "coefficients": [1034.87, 2397, 173.10]},
+            {"start": 69878, "origin": 0, "coefficients": [-11135.63, 0.42]},
+            {"start": 277825, "origin": 0, "coefficients": [-19470.38, 0.45]},
+        ],
+        "soli": {"freigrenze": 20350, "satz": 0.055, "milderungssatz": 0.119},
+    }
+    steuern["werbungskostenpauschale"][2026] = 1230
+    steuern["krankenversicherung"]["beitragsbemessungsgrenzen"][2026] = 69750
+    steuern["krankenversicherung"]["mindestbemessungsgrundlage"][2026] = 15819.96
+
+    assert calc_tax(40000, False, 2026, config) == 7209.63
+    assert calculate_business_report(CalculationInput(steuerjahr=2026), config)["steuerjahr"] == 2026
+
+
+def test_compile_tariff_rejects_invalid_schema() -> None:
+    valid = CONFIG["steuern"]["einkommensteuer"][2025]
+
+    unsorted = copy.deepcopy(valid)
+    unsorted["zones"][1], unsorted["zones"][2] = unsorted["zones"][2], unsorted["zones"][1]
+    with pytest.raises(ValueError, match="aufsteigend"):
+        compile_tariff(2025, unsorted)
+
+    jump = copy.deepcopy(valid)
+    jump["zones"][3]["coefficients"][0] -= 100
+    with pytest.raises(ValueError, match="nicht stetig"):
+        compile_tariff(2025, jump)
+
+    no_soli = copy.deepcopy(valid)
+    del no_soli["soli"]
+    with pytest.raises(ValueError, match="soli"):
+        compile_tariff(2025, no_soli)
+
+    with pytest.raises(ValueError, match="nicht in der Konfiguration"):
+        get_tariff(1999, CONFIG)
+
+
+def test_soli_freigrenze_and_milderungszone() -> None:
+    tariff = get_tariff(2025, CONFIG)
+
+    assert tariff.solidaritaetszuschlag(19950, False) == 0.0
+    assert tariff.solidaritaetszuschlag(20950, False) == pytest.approx(119.0)
+    assert tariff.solidaritaetszuschlag(60000, False) == pytest.approx(3300.0)
+    assert tariff.solidaritaetszuschlag(39900, True) == 0.0
+
+
+def test_compiled_tariffs_are_bounded_and_follow_config_content() -> None:
+    for _ in range(2 * COMPILED_CACHE_SIZE):
+        get_tariff(2025, Helper.load_config_yml())
+    assert len(tariff_module._COMPILED) <= COMPILED_CACHE_SIZE
+    assert get_tariff(2025, Helper.load_config_yml()) is get_tariff(2025, CONFIG)
+
+    assert get_tariff(2025, CONFIG).solidaritaetszuschlag(25000, False) > 0
+    edited = copy.deepcopy(CONFIG)
+    edited["steuern"]["einkommensteuer"][2025]["soli"]["freigrenze"] = 30000
+    assert get_tariff(2025, edited).solidaritaetszuschlag(25000, False) == 0.0
+    assert get_tariff(2025, CONFIG).solidaritaetszuschlag(25000, False) > 0